@@ -4,16 +4,32 @@
 # AUTHORS: Diego de las Heras (ngosang@hotmail.es)
 # CONTRIBUTORS: ukharley, hannsen, Alexander Georgievskiy, qb-rewrite[bot], Kain
 
+import calendar
+import gzip
+import hashlib
+import http.client
 import json
 import os
-import re
+import tempfile
+import time
 import urllib.request
-import xml.etree.ElementTree as ET
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
-from http.cookiejar import CookieJar
-from multiprocessing.dummy import Pool
-from threading import Lock
-from urllib.parse import unquote, urlencode
+from functools import lru_cache
+from io import BytesIO
+from threading import Lock, local
+from urllib.parse import quote_plus, unquote, urlencode, urljoin, urlsplit
+
+try:
+    from lxml import etree as ET  # libxml2 parses large Torznab feeds several times faster
+
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET  # backed by the _elementtree C accelerator on Python 3
+
+    HAS_LXML = False
 
 # qBittorrent-specific imports
 import helpers
@@ -28,32 +44,66 @@ CONFIG_DEFAULTS = {
     "tracker_first": False,
     "thread_count": 20,
     "deduplicate": True,  # New: Enable or disable result deduplication
+    "use_aggregate_indexer": False,  # Query Jackett's "all" indexer instead of fanning out per indexer
 }
+CONFIG_CACHE = {"mtime": None, "data": None}
+CONFIG_LOCK = Lock()
 PRINTER_LOCK = Lock()
+PARSERS = local()  # lxml parsers aren't thread-safe, so each thread reuses its own
+# Torznab feeds need no DTDs, entities, comments or PIs; skipping them also shuts out XXE tricks
+LXML_PARSER_OPTIONS = {
+    "resolve_entities": False,
+    "no_network": True,
+    "huge_tree": False,
+    "remove_comments": True,
+    "remove_pis": True,
+}
+INDEXER_CACHE_PATH = os.path.join(os.path.dirname(CONFIG_PATH), "jackett_indexers.json")
+INDEXER_CACHE_TTL = 300  # Seconds to reuse the configured indexer list between searches
+TORZNAB_NS = "http://torznab.com/schemas/2015/feed"
+TORZNAB_ATTR = f"{{{TORZNAB_NS}}}attr"  # Built once; compared against each child's tag
+BTIH_PREFIX = "xt=urn:btih:"
+BTIH_PREFIX_LEN = len(BTIH_PREFIX)
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+PUB_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S %z"
+WEEKDAYS = frozenset("Mon Tue Wed Thu Fri Sat Sun".split())
+MONTHS = dict(zip("Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), range(1, 13)))
+
+
+def write_json_atomically(path, data):
+    """Write JSON to a temp file and rename it over `path`, so an interrupted write can't truncate it."""
+    directory, filename = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=filename, suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def save_configuration(config):
+    """Write the configuration file."""
+    write_json_atomically(CONFIG_PATH, config)
 
 
 def load_configuration():
     """Load configuration from JSON file or create it with defaults."""
     config = CONFIG_DEFAULTS.copy()
-    # Ensure config file exists before trying to read
     if not os.path.exists(CONFIG_PATH):
-        with open(CONFIG_PATH, "w") as f:
-            json.dump(config, f, indent=4, sort_keys=True)
+        save_configuration(config)
+        return config
 
     try:
         with open(CONFIG_PATH, "r") as f:
             user_config = json.load(f)
-            # Add any new default keys to user config
-            updated = False
-            for key, value in CONFIG_DEFAULTS.items():
-                if key not in user_config:
-                    user_config[key] = value
-                    updated = True
-            config.update(user_config)
-            if updated:
-                with open(CONFIG_PATH, "w") as f:
-                    json.dump(config, f, indent=4, sort_keys=True)
-    except (json.JSONDecodeError, TypeError):
+        # Only rewrite the file when new default keys have to be added to it
+        missing = [key for key in CONFIG_DEFAULTS if key not in user_config]
+        config.update(user_config)
+        if missing:
+            save_configuration(config)
+    except (TypeError, ValueError):  # ValueError includes json.JSONDecodeError
         config["malformed"] = True
 
     if not all(key in config for key in ["api_key", "url", "tracker_first", "thread_count"]):
@@ -62,25 +112,55 @@ def load_configuration():
     return config
 
 
-CONFIG_DATA = load_configuration()
+def config_mtime():
+    """Returns the modification time of jackett.json in nanoseconds, or None if it doesn't exist."""
+    try:
+        return os.stat(CONFIG_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_configuration():
+    """Loads the configuration on first use and again only after jackett.json changes on disk.
+
+    Nothing is read at import time, so merely enumerating the plugin doesn't touch the disk.
+    The returned dict is shared and must be treated as read-only.
+    """
+    mtime = config_mtime()
+    with CONFIG_LOCK:
+        if CONFIG_CACHE["data"] is None or mtime is None or mtime != CONFIG_CACHE["mtime"]:
+            CONFIG_CACHE["data"] = load_configuration()
+            # Loading may have (re)written the file, so record the mtime of what was read
+            CONFIG_CACHE["mtime"] = config_mtime()
+        return CONFIG_CACHE["data"]
+
+
+class ConfiguredURL:
+    """Class attribute descriptor that reads the Jackett URL from the configuration when accessed."""
+
+    def __get__(self, instance, owner):
+        return get_configuration()["url"].rstrip("/")
 
 
 # --- Proxy Management ---
 class ProxyManager:
-    """Manages enabling/disabling system-wide proxy settings for requests."""
+    """Keeps the user's HTTP(S) proxy settings and toggles the SOCKS proxy for requests."""
 
     def __init__(self):
-        self.http_proxy = os.getenv("http_proxy", "")
-        self.https_proxy = os.getenv("https_proxy", "")
-
-    def enable(self, is_enabled: bool):
-        """Toggles the proxy settings on or off."""
-        if is_enabled:
-            os.environ["http_proxy"] = self.http_proxy
-            os.environ["https_proxy"] = self.https_proxy
-        else:
-            os.environ.pop("http_proxy", None)
-            os.environ.pop("https_proxy", None)
+        self.proxies = {scheme: os.getenv(f"{scheme}_proxy") for scheme in ("http", "https")}
+        self.proxies = {scheme: url for scheme, url in self.proxies.items() if url}
+        # Requests stay direct unless they go through `proxy_opener`
+        os.environ.pop("http_proxy", None)
+        os.environ.pop("https_proxy", None)
+        self.direct_opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        self.proxy_opener = urllib.request.build_opener(urllib.request.ProxyHandler(self.proxies))
+
+    def opener(self, use_proxy: bool):
+        """Returns the shared urllib opener with or without the user's HTTP(S) proxy."""
+        return self.proxy_opener if use_proxy else self.direct_opener
+
+    def enable_socks(self, is_enabled: bool):
+        """Toggles qBittorrent's SOCKS proxy, which patches the socket module process-wide."""
         try:
             helpers.enable_socks_proxy(is_enabled)
         except AttributeError:
@@ -88,12 +168,230 @@ class ProxyManager:
 
 
 proxy_manager = ProxyManager()
-proxy_manager.enable(False)
+proxy_manager.enable_socks(False)
+
+
+# --- Indexer Caching ---
+class IndexerCache:
+    """Remembers configured indexer ids for a TTL, in memory and on disk across plugin runs."""
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = Lock()
+
+    def get(self, key):
+        """Returns the cached indexer ids for `key`, or None if they are missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry["ts"] >= self.ttl:
+                # qBittorrent starts a new process per search, so the disk copy is what usually hits
+                entry = self._read(key)
+                if entry is None:
+                    return None
+                self._entries[key] = entry
+        return entry["ids"] if now - entry["ts"] < self.ttl else None
+
+    def set(self, key, ids):
+        entry = {"ts": time.time(), "ids": ids}
+        with self._lock:
+            self._entries[key] = entry
+            try:
+                write_json_atomically(self.path, dict(entry, key=self._digest(key)))
+            except OSError:
+                pass  # The disk copy is only an optimization
+
+    def invalidate(self):
+        """Drops every cached entry, forcing the next search to ask Jackett again."""
+        with self._lock:
+            self._entries.clear()
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _read(self, key):
+        try:
+            with open(self.path, "r") as f:
+                entry = json.load(f)
+            if entry["key"] == self._digest(key):
+                return {"ts": float(entry["ts"]), "ids": list(entry["ids"])}
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        return None
+
+    @staticmethod
+    def _digest(key):
+        # Don't copy the API key that is part of `key` into a second file
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+indexer_cache = IndexerCache(INDEXER_CACHE_PATH, INDEXER_CACHE_TTL)
+
+
+# --- Connection Pooling ---
+API_HEADERS = {"Accept-Encoding": "gzip, deflate", "User-Agent": "qBittorrent-jackett/2.0"}
+REDIRECT_CODES = frozenset((301, 302, 303, 307, 308))
+MAX_REDIRECTS = 5
+
+
+def decompress_body(body, content_encoding):
+    """Undoes the Content-Encoding Jackett applied to a response body."""
+    content_encoding = (content_encoding or "").strip().lower()
+    if content_encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if content_encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)  # Raw deflate stream without zlib header
+    return body
+
+
+class ConnectionPool:
+    """Keeps idle keep-alive connections so repeated Jackett API calls skip the TCP/TLS handshake."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._idle = {}
+        self._lock = Lock()
+
+    def _acquire(self, key, timeout):
+        """Returns an idle connection for `key` if there is one, else a new one, plus a reused flag."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, netloc = key
+        conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return conn_class(netloc, timeout=timeout), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def urlopen(self, key, path, headers=None, timeout=20):
+        """Yields the response to a GET of `path` (with its query) on the (scheme, netloc) `key`.
+
+        The connection is pooled again afterwards if the response was fully read.
+        """
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request("GET", path, headers=headers or {})
+                response = conn.getresponse()
+                break
+            except ConnectionError:
+                conn.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection, retry on a fresh one
+            except Exception:
+                conn.close()
+                raise
+        try:
+            yield response
+        finally:
+            if response.isclosed() and not response.will_close:
+                self._release(key, conn)
+            else:
+                conn.close()
+
+
+connection_pool = ConnectionPool(CONFIG_DEFAULTS["thread_count"])
+
+
+# --- Parsing Helpers ---
+@lru_cache(maxsize=4096)  # Feeds often repeat timestamps, e.g. the same release across indexers
+def parse_pub_date(pub_date_str):
+    """Converts an RFC 822 pubDate to a Unix timestamp, or -1 if it can't be parsed."""
+    try:
+        # Fast path for the "Mon, 02 Jan 2006 15:04:05 -0700" layout Jackett emits
+        day, month, year, clock, offset = pub_date_str[5:].split(" ")
+        hours, minutes, seconds = clock.split(":")
+        digits = day + year + hours + minutes + seconds + offset[1:]
+        if (
+            pub_date_str[:3] in WEEKDAYS
+            and pub_date_str[3:5] == ", "
+            and len(day) <= 2
+            and len(year) == 4
+            and len(clock) == 8
+            and len(offset) == 5
+            and offset[0] in "+-"
+            and digits.isascii()  # isdigit() alone also admits non-ASCII digits, which strptime rejects
+            and digits.isdigit()
+        ):
+            year, month, day = int(year), MONTHS[month], int(day)
+            hours, minutes, seconds = int(hours), int(minutes), int(seconds)
+            offset_hours, offset_minutes = int(offset[1:3]), int(offset[3:5])
+            if (
+                year >= 1
+                and 1 <= day <= calendar.monthrange(year, month)[1]
+                and hours < 24
+                and minutes < 60
+                and seconds < 60
+                and offset_hours < 24
+                and offset_minutes < 60
+            ):
+                utc_offset = (offset_hours * 3600 + offset_minutes * 60) * (-1 if offset[0] == "-" else 1)
+                return calendar.timegm((year, month, day, hours, minutes, seconds)) - utc_offset
+    except (KeyError, ValueError):
+        pass
+    # Anything else, e.g. a "-07:00" offset or an impossible date, gets the strict parse
+    try:
+        return int(datetime.strptime(pub_date_str, PUB_DATE_FORMAT).timestamp())
+    except (ValueError, OverflowError):
+        return -1
+
+
+def xml_parser():
+    """Returns this thread's reusable, feature-trimmed lxml parser, or None for ElementTree's default."""
+    if not HAS_LXML:
+        return None
+    parser = getattr(PARSERS, "parser", None)
+    if parser is None:
+        parser = PARSERS.parser = ET.XMLParser(collect_ids=False, **LXML_PARSER_OPTIONS)
+    return parser
+
+
+def iter_feed_items(source):
+    """Yields each <channel><item> of a Torznab feed as soon as it is parsed, then discards it."""
+    if HAS_LXML:
+        # libxml2 filters the events, so only completed <item> elements reach Python
+        # recover keeps the items parsed before a malformed spot instead of dropping the whole feed
+        for _, item in ET.iterparse(source, events=("end",), tag="item", recover=True, **LXML_PARSER_OPTIONS):
+            channel = item.getparent()
+            if channel is None or channel.tag != "channel":
+                continue
+            yield item
+            item.clear()
+            while item.getprevious() is not None:
+                del channel[0]
+        return
+
+    # ElementTree has no getparent(), so keep the open ancestors to find each <item>'s parent
+    ancestors = []
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            ancestors.append(elem)
+            continue
+        ancestors.pop()
+        if elem.tag == "item" and ancestors and ancestors[-1].tag == "channel":
+            yield elem
+            elem.clear()
+            ancestors[-1].remove(elem)
 
 
 # --- Main Plugin Class ---
 class jackett(object):
-    url = CONFIG_DATA["url"].rstrip("/")
+    url = ConfiguredURL()
     name = "Jackett"
     supported_categories = {
         "all": None,
@@ -107,20 +405,35 @@ class jackett(object):
     }
 
     def __init__(self):
-        self.api_key = CONFIG_DATA["api_key"]
-        self.tracker_first = CONFIG_DATA.get("tracker_first", False)
-        self.thread_count = CONFIG_DATA.get("thread_count", 20)
-        self.deduplicate = CONFIG_DATA.get("deduplicate", True)
-        self.is_malformed = CONFIG_DATA.get("malformed", False)
-        self.info_hash_re = re.compile(r"xt=urn:btih:([a-fA-F0-9]{40})")
+        config = get_configuration()
+        self.url = config["url"].rstrip("/")  # Shadows the class descriptor for per-item lookups
+        self.api_key = config["api_key"]
+        self.tracker_first = config.get("tracker_first", False)
+        self.thread_count = config.get("thread_count", 20)
+        self.deduplicate = config.get("deduplicate", True)
+        self.use_aggregate_indexer = config.get("use_aggregate_indexer", False)
+        self.is_malformed = config.get("malformed", False)
+        connection_pool.maxsize = self.thread_count
+        # Kept for the plugin's lifetime so later searches reuse the already started worker threads
+        self.executor = ThreadPoolExecutor(max_workers=self.thread_count) if self.thread_count > 1 else None
+        # Split the URL once; pooled requests only send the path and query
+        url_parts = urlsplit(self.url)
+        self.api_origin = (url_parts.scheme, url_parts.netloc)
+        self.api_path = f"{url_parts.path}/api/v2.0/indexers"
+        # Per-category query string prefixes, leaving only the search terms to append
+        api_key = quote_plus(str(self.api_key))
+        self.search_params = {
+            cat: f"apikey={api_key}&cat={','.join(ids)}" if ids else f"apikey={api_key}"
+            for cat, ids in self.supported_categories.items()
+        }
 
     def download_torrent(self, download_url):
         if download_url.startswith("magnet:"):
             self._safe_print_link(download_url, download_url)
             return
-        proxy_manager.enable(True)
-        response_content = self._fetch_url(download_url)
-        proxy_manager.enable(False)
+        proxy_manager.enable_socks(True)
+        response_content = self._fetch_url(download_url, use_proxy=True)
+        proxy_manager.enable_socks(False)
         if response_content and response_content.startswith("magnet:"):
             self._safe_print_link(response_content, download_url)
         else:
@@ -128,84 +441,110 @@ class jackett(object):
 
     def search(self, what, cat="all"):
         search_query = unquote(what)
-        category_ids = self.supported_categories.get(cat.lower())
+        # Encode the query once per search; each indexer request only changes the path
+        params = self.search_params.get(cat.lower()) or self.search_params["all"]
+        query_string = f"{params}&q={quote_plus(search_query)}"
 
         if self.is_malformed:
             return self._handle_error("malformed configuration file", search_query)
         if self.api_key == "YOUR_API_KEY_HERE":
             return self._handle_error("API key is not configured", search_query)
 
+        if self.use_aggregate_indexer:
+            # Jackett fans out to every configured indexer and merges the results server-side
+            xml_data = self._fetch_indexer(query_string, "all")
+            if xml_data is None:
+                return self._handle_error("could not connect to Jackett to search all indexers", search_query)
+            self._print_results([self._parse_feed(xml_data)])
+            return
+
         indexers = self._get_configured_indexers(search_query)
         if not indexers:
             return
 
-        search_args = [(search_query, category_ids, idx) for idx in indexers]
-
         # --- Collect Results ---
-        all_results = []
-        if self.thread_count > 1 and len(search_args) > 1:
-            with Pool(min(len(search_args), self.thread_count)) as pool:
-                results_from_threads = pool.starmap(self._search_indexer, search_args)
-            # Flatten the list of lists into a single list
-            all_results = [item for sublist in results_from_threads for item in sublist]
+        if self.executor and len(indexers) > 1:
+            futures = [self.executor.submit(self._fetch_indexer, query_string, idx) for idx in indexers]
+            # Workers only fetch; each feed is parsed here as soon as its indexer answers
+            feeds = (future.result() for future in as_completed(futures))
         else:
-            all_results = self._search_indexer(search_query, category_ids, "all")
-
-        if not all_results:
-            return
-
-        # --- Deduplicate and Print ---
+            feeds = [self._fetch_indexer(query_string, "all")]
+        answered = []
+        self._print_results(self._parse_feeds(feeds, answered))
+        if not any(answered):
+            # The indexer list may have come from the cache while Jackett itself is unreachable
+            indexer_cache.invalidate()
+            self._handle_error("could not connect to Jackett to search the indexers", search_query)
+
+    def _print_results(self, result_batches):
+        """Prints results from an iterable of per-indexer result lists, deduplicating if enabled."""
         if self.deduplicate:
+            # Maps each key to a (seeds, result) tuple, keeping the best-seeded copy
             unique_torrents = {}
-            for result in all_results:
-                info_hash = self._get_info_hash_from_magnet(result["link"])
-                # If no info_hash, we can't deduplicate it, so use its link as a unique key
-                key = info_hash if info_hash else result["link"]
-
-                if key not in unique_torrents or result["seeds"] > unique_torrents[key]["seeds"]:
-                    unique_torrents[key] = result
-
-            for torrent in unique_torrents.values():
-                self._safe_print(torrent)
+            get_info_hash = self._get_info_hash_from_magnet
+            for results in result_batches:
+                for result in results:
+                    link = result["link"]
+                    info_hash = result.pop("_infohash", None)
+                    if not info_hash and link.startswith("magnet:"):
+                        info_hash = get_info_hash(link)
+                    # If no info_hash, we can't deduplicate it, so use its link as a unique key
+                    key = info_hash or link
+                    seeds = result["seeds"]
+                    best = unique_torrents.get(key)
+                    if best is None or seeds > best[0]:
+                        unique_torrents[key] = (seeds, result)
+
+            self._safe_print_many(torrent for _, torrent in unique_torrents.values())
         else:
-            # Print all results without deduplication
-            for result in all_results:
-                self._safe_print(result)
+            # Print all results without deduplication, one batch per indexer as they arrive
+            for results in result_batches:
+                self._safe_print_many(results)
 
     def _get_configured_indexers(self, context_query):
+        cache_key = f"{self.url} {self.api_key}"
+        indexers = indexer_cache.get(cache_key)
+        if indexers:
+            return indexers
+
         params = urlencode({"apikey": self.api_key, "t": "indexers", "configured": "true"})
-        api_url = f"{self.url}/api/v2.0/indexers/all/results/torznab/api?{params}"
-        xml_data = self._fetch_url(api_url)
+        xml_data = self._fetch_api(f"{self.api_path}/all/results/torznab/api?{params}")
         if not xml_data:
             self._handle_error("could not connect to Jackett to get indexer list", context_query)
             return []
         try:
-            root = ET.fromstring(xml_data)
-            return [indexer.attrib["id"] for indexer in root.findall("indexer")]
+            root = ET.fromstring(xml_data, parser=xml_parser())
+            indexers = [indexer.attrib["id"] for indexer in root.iterfind("indexer")]
         except ET.ParseError:
             self._handle_error("failed to parse Jackett indexer list (invalid XML)", context_query)
             return []
 
-    def _search_indexer(self, query, category_ids, indexer_id):
-        """Searches an indexer and *returns* a list of parsed result dicts."""
-        params = [("apikey", self.api_key), ("q", query)]
-        if category_ids:
-            params.append(("cat", ",".join(category_ids)))
-        api_url = f"{self.url}/api/v2.0/indexers/{indexer_id}/results/torznab/api?{urlencode(params)}"
+        if indexers:
+            indexer_cache.set(cache_key, indexers)
+        return indexers
+
+    def _fetch_indexer(self, query_string, indexer_id):
+        """Fetches the raw Torznab feed of an indexer search, or None."""
+        return self._fetch_api(f"{self.api_path}/{indexer_id}/results/torznab/api?{query_string}")
 
-        xml_data = self._fetch_url(api_url)
+    def _parse_feeds(self, feeds, answered):
+        """Parses raw feeds one at a time, appending to `answered` whether each fetch succeeded."""
+        for xml_data in feeds:
+            answered.append(xml_data is not None)
+            yield self._parse_feed(xml_data)
+
+    def _parse_feed(self, xml_data):
+        """Parses a raw Torznab feed into a list of result dicts."""
         if not xml_data:
             return []
 
         found_items = []
         try:
-            root = ET.fromstring(xml_data)
-            channel = root.find("channel")
-            if channel is not None:
-                for item in channel.findall("item"):
-                    parsed = self._parse_item(item)
-                    if parsed:
-                        found_items.append(parsed)
+            # Parse incrementally so only one <item> subtree is alive at a time
+            for item in iter_feed_items(BytesIO(xml_data)):
+                parsed = self._parse_item(item)
+                if parsed:
+                    found_items.append(parsed)
         except ET.ParseError:
             pass  # Ignore parse errors for individual indexers
         return found_items
@@ -213,60 +552,130 @@ class jackett(object):
     def _parse_item(self, item):
         """Parses an <item> element and returns a result dict, or None."""
         try:
-            title = item.findtext("title")
+            # Single pass over the children instead of one find() per field
+            title = tracker = link = comments = guid = pub_date_str = None
+            size = "-1"
+            attrs = {}
+            for child in item:
+                tag = child.tag
+                if tag == TORZNAB_ATTR:
+                    attrs[child.get("name")] = child.get("value")
+                elif tag == "title":
+                    title = child.text
+                elif tag == "jackettindexer":
+                    tracker = child.text or ""
+                elif tag == "link":
+                    link = child.text
+                elif tag == "size":
+                    size = child.text or ""
+                elif tag == "pubDate":
+                    pub_date_str = child.text
+                elif tag == "comments":
+                    comments = child.text
+                elif tag == "guid":
+                    guid = child.text
+
+            # Reject unusable items before doing any formatting or number parsing
             if not title:
                 return None
-
-            tracker = item.findtext("jackettindexer")
-            name = f"[{tracker}] {title}" if self.tracker_first else f"{title} [{tracker}]"
-
-            torznab_ns = "{http://torznab.com/schemas/2015/feed}"
-            magnet_el = item.find(f'./{torznab_ns}attr[@name="magneturl"]')
-            link = magnet_el.get("value") if magnet_el is not None else item.findtext("link")
+            if "magneturl" in attrs:
+                link = attrs["magneturl"]
             if not link:
                 return None
 
-            size = item.findtext("size", default="-1") + " B"
-            seeds_el = item.find(f'./{torznab_ns}attr[@name="seeders"]')
-            peers_el = item.find(f'./{torznab_ns}attr[@name="peers"]')
-            seeds = int(seeds_el.get("value")) if seeds_el is not None else -1
-            peers = int(peers_el.get("value")) if peers_el is not None else -1
+            name = f"[{tracker}] {title}" if self.tracker_first else f"{title} [{tracker}]"
+            size += " B"
+            seeds = attrs.get("seeders")
+            peers = attrs.get("peers")
+            seeds = int(seeds) if seeds else -1
+            peers = int(peers) if peers else -1
             leech = (peers - seeds) if (seeds != -1 and peers != -1) else -1
 
-            pub_date = -1
-            pub_date_str = item.findtext("pubDate")
-            if pub_date_str:
-                try:
-                    dt_object = datetime.strptime(pub_date_str, "%a, %d %b %Y %H:%M:%S %z")
-                    pub_date = int(dt_object.timestamp())
-                except ValueError:
-                    pass
+            pub_date = parse_pub_date(pub_date_str) if pub_date_str else -1
 
-            return {
+            result = {
                 "name": name.replace("|", "%7C"),
                 "link": link,
                 "size": size,
                 "seeds": seeds,
                 "leech": leech,
                 "engine_url": self.url,
-                "desc_link": item.findtext("comments") or item.findtext("guid", ""),
+                "desc_link": comments or guid or "",
                 "pub_date": pub_date,
             }
+            if self.deduplicate:
+                # Most indexers send the info hash directly, sparing the magnet link lookup
+                info_hash = attrs.get("infohash")
+                result["_infohash"] = info_hash.lower() if info_hash else None
+            return result
         except Exception:
             return None
 
     def _get_info_hash_from_magnet(self, magnet_link):
-        """Extracts the info hash from a magnet link using regex."""
+        """Extracts the hex info hash from a magnet link."""
         if not magnet_link or not magnet_link.startswith("magnet:"):
             return None
-        match = self.info_hash_re.search(magnet_link)
-        return match.group(1).lower() if match else None
+        start = magnet_link.find(BTIH_PREFIX)
+        if start < 0:
+            return None
+        start += BTIH_PREFIX_LEN
+        info_hash = magnet_link[start : start + 40]
+        return info_hash.lower() if len(info_hash) == 40 and HEX_DIGITS.issuperset(info_hash) else None
+
+    def _fetch_api(self, path):
+        """Fetches a Jackett API path over a pooled connection and returns the raw body, or None.
 
-    def _fetch_url(self, url):
+        Redirects are followed for up to MAX_REDIRECTS hops; those leaving the configured
+        scheme and host can't use the pool and are handed to urllib instead.
+        """
+        origin = self.api_origin
         try:
-            opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
-            response = opener.open(url, timeout=20)
-            return response.read().decode("utf-8", "ignore")
+            for _ in range(MAX_REDIRECTS + 1):
+                with connection_pool.urlopen(origin, path, headers=API_HEADERS) as response:
+                    body = response.read()
+                    status = response.status
+                    if status == 200:
+                        return decompress_body(body, response.getheader("Content-Encoding"))
+                    location = response.getheader("Location")
+                if status in REDIRECT_CODES and location:
+                    target = urlsplit(urljoin(f"{origin[0]}://{origin[1]}{path}", location))
+                    if (target.scheme, target.netloc) != origin:
+                        return self._fetch_api_url(target.geturl())
+                    path = target.path or "/"
+                    if target.query:
+                        path += f"?{target.query}"
+                    continue
+                if status == 404:
+                    # Jackett no longer knows this indexer, so the cached list is stale
+                    indexer_cache.invalidate()
+                return None
+        except Exception:
+            pass  # One bad fetch must never abort the whole search
+        return None
+
+    def _fetch_api_url(self, url):
+        """Fetches an absolute API URL through urllib, which follows any further redirects itself."""
+        if urlsplit(url).scheme not in ("http", "https"):
+            return None
+        request = urllib.request.Request(url, headers=API_HEADERS)
+        try:
+            with proxy_manager.opener(False).open(request, timeout=20) as response:
+                return decompress_body(response.read(), response.headers.get("Content-Encoding"))
+        except urllib.request.HTTPError as e:
+            if e.code == 404:
+                indexer_cache.invalidate()
+        except Exception:
+            pass  # One bad fetch must never abort the whole search
+        return None
+
+    def _fetch_url(self, url, use_proxy=False):
+        try:
+            with proxy_manager.opener(use_proxy).open(url, timeout=20) as response:
+                # Only a magnet link body is of interest; don't read or decode a binary .torrent
+                prefix = response.read(len("magnet:"))
+                if prefix != b"magnet:":
+                    return None
+                return (prefix + response.read()).decode("utf-8", "ignore")
         except urllib.request.HTTPError as e:
             return e.url if e.code == 302 else None
         except Exception:
@@ -292,6 +701,12 @@ class jackett(object):
         with PRINTER_LOCK:
             prettyPrinter(data)
 
+    def _safe_print_many(self, results):
+        """Prints several results under a single acquisition of the printer lock."""
+        with PRINTER_LOCK:
+            for data in results:
+                prettyPrinter(data)
+
 
 if __name__ == "__main__":
     engine = jackett()